@@ -1,18 +1,29 @@
 import os
-import json
+import io
+import re
+import orjson
 import shutil
 import random
-import requests
+import asyncio
+import aiohttp
 from pathlib import Path
-from pydub import AudioSegment
-import tempfile
+from mutagen import File as MutaFile
 import argparse
+import subprocess
 import time
 import logging
-from typing import Optional, Dict, Any, List
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
-import hashlib
+from functools import lru_cache
+import xxhash
+
+# Characters that are invalid in most file systems, mapped to '_'
+_INVALID_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+_PAREN = re.compile(r'\([^)]*\)')
+_BRACK = re.compile(r'\[[^\]]*\]')
 
 
 @dataclass
@@ -25,6 +36,42 @@ class ProcessingStats:
     duplicates: int = 0
 
 
+class TokenBucket:
+    """Token bucket that throttles API requests before they are sent"""
+
+    def __init__(self, capacity: float, fill_rate: float):
+        """
+        Args:
+            capacity: Maximum number of tokens, i.e. the largest allowed burst
+            fill_rate: Tokens added per second, i.e. the sustained requests per second
+        """
+        self.capacity = capacity
+        self.fill_rate = fill_rate
+        self.tokens = capacity
+        self.last_fill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        """Add the tokens earned since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_fill) * self.fill_rate)
+        self.last_fill = now
+
+    async def acquire(self):
+        """Wait the minimum time needed for a token, then take it"""
+        async with self.lock:
+            self.refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+                self.refill()
+            self.tokens -= 1
+
+    def drain(self):
+        """Empty the bucket after the server reported that the limit was hit"""
+        self.refill()
+        self.tokens = 0
+
+
 class AudioOrganizer:
     def __init__(self, api_token: str, input_folder: str, output_folder: str,
                  dry_run: bool = False, log_level: str = "INFO", clip_duration: int = 10):
@@ -44,6 +91,8 @@ class AudioOrganizer:
         self.dry_run = dry_run
         self.clip_duration = clip_duration
         self.supported_formats = {'.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg', '.wma'}
+        # Same extensions as a tuple for a single str.endswith call per directory entry
+        self._ext_tuple = tuple(self.supported_formats)
 
         # Setup logging
         self.setup_logging(log_level)
@@ -55,10 +104,49 @@ class AudioOrganizer:
         # Progress tracking
         self.processed_files = []
         self.failed_files = []
+        self.results_log = None
 
-        # Cache for file hashes to detect duplicates
+        # Cache for file hashes to detect duplicates, hash -> path
         self.file_hashes = {}
 
+        # Hashes computed during this run, path -> (size, mtime, hash)
+        self.path_hashes: Dict[str, Tuple[int, int, str]] = {}
+
+        # Files grouped by size that have not been hashed yet, only size collisions get hashed
+        self.size_index: Dict[int, List[Path]] = {}
+
+        # Locks shared by the worker threads preparing files
+        self.index_lock = threading.Lock()
+        self.size_locks: Dict[int, threading.Lock] = {}
+        self.db_lock = threading.Lock()
+
+        # Persistent hash cache so unchanged files are not re-read on later runs
+        self.setup_hash_cache()
+
+    def setup_hash_cache(self):
+        """Open the SQLite hash cache stored in the output folder"""
+        if self.output_folder.is_dir():
+            db_path = str(self.output_folder / '.hash_cache.db')
+        else:
+            # Dry run without an output folder yet, keep the cache for this run only
+            db_path = ':memory:'
+
+        self.hash_db = sqlite3.connect(db_path, check_same_thread=False)
+        self.hash_db.execute('PRAGMA journal_mode=WAL')
+        self.hash_db.execute('PRAGMA synchronous=NORMAL')
+        self.hash_db.execute(
+            'CREATE TABLE IF NOT EXISTS files ('
+            'path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, hash TEXT)'
+        )
+        self.hash_db.commit()
+        self.pending_hash_writes = 0
+
+    def close_hash_cache(self):
+        """Flush pending hash cache writes and close the database"""
+        with self.db_lock:
+            self.hash_db.commit()
+            self.hash_db.close()
+
     def setup_logging(self, log_level: str):
         """Setup logging configuration"""
         logging.basicConfig(
@@ -72,88 +160,251 @@ class AudioOrganizer:
         self.logger = logging.getLogger(__name__)
 
     def get_file_hash(self, file_path: Path) -> str:
+        """Get file hash from the cache, computing it if the file changed"""
+        path = str(file_path.resolve())
+        stat = file_path.stat()
+
+        with self.db_lock:
+            row = self.hash_db.execute(
+                'SELECT size, mtime, hash FROM files WHERE path = ?', (path,)
+            ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        file_hash = self.compute_file_hash(file_path)
+        with self.db_lock:
+            self.hash_db.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)',
+                (path, stat.st_size, stat.st_mtime_ns, file_hash)
+            )
+
+            # Commit in batches to keep writes cheap
+            self.pending_hash_writes += 1
+            if self.pending_hash_writes >= 100:
+                self.hash_db.commit()
+                self.pending_hash_writes = 0
+
+        return file_hash
+
+    def _hash_of(self, file_path: Path) -> str:
+        """Get file hash, reusing the one computed earlier in this run if the file is unchanged"""
+        stat = file_path.stat()
+        key = str(file_path)
+
+        cached = self.path_hashes.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        file_hash = self.get_file_hash(file_path)
+        self.path_hashes[key] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        return file_hash
+
+    def compute_file_hash(self, file_path: Path) -> str:
         """Generate hash for file to detect duplicates"""
-        hash_md5 = hashlib.md5()
+        file_hash = xxhash.xxh3_128()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    def size_lock(self, size: int) -> threading.Lock:
+        """Get the lock serializing hashing and moves of files with this size"""
+        with self.index_lock:
+            lock = self.size_locks.get(size)
+            if lock is None:
+                lock = self.size_locks[size] = threading.Lock()
+            return lock
+
+    def is_duplicate(self, file_path: Path) -> bool:
+        """Check if file content was already seen, hashing only when sizes collide"""
+        size = file_path.stat().st_size
+        with self.index_lock:
+            if size not in self.size_index:
+                self.size_index[size] = [file_path]
+                return False
+
+        # Hash outside index_lock so workers checking other sizes are not held up by disk reads.
+        # The size lock keeps a same-size file from missing an incumbent that is still being hashed.
+        with self.size_lock(size):
+            # Same size as an earlier file, take the files still waiting in this bucket
+            with self.index_lock:
+                incumbents = self.size_index[size]
+                self.size_index[size] = []
+
+            hashes = []
+            for other in incumbents:
+                try:
+                    hashes.append((self._hash_of(other), other))
+                except FileNotFoundError:
+                    # Deleted since it was indexed, moves are excluded by the size lock
+                    continue
+            file_hash = self._hash_of(file_path)
+
+            with self.index_lock:
+                for other_hash, other in hashes:
+                    self.file_hashes.setdefault(other_hash, str(other))
+                if file_hash in self.file_hashes:
+                    return True
+
+                self.file_hashes[file_hash] = str(file_path)
+                return False
+
+    def update_size_index(self, source: Path, target: Path, size: int):
+        """Point an unhashed size index entry to the new location of a moved file"""
+        try:
+            if target.stat().st_size != size:
+                # The existing, different target was kept and the source is gone
+                return
+        except FileNotFoundError:
+            return
+
+        with self.index_lock:
+            paths = self.size_index.get(size)
+            if paths and source in paths:
+                paths[paths.index(source)] = target
+
+    def _walk(self, folder: str):
+        """Yield supported audio files below folder, filtering on the raw entry name"""
+        try:
+            entries = os.scandir(folder)
+        except OSError as e:
+            self.logger.warning(f"Skipping unreadable folder {folder}: {e}")
+            return
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk(entry.path)
+                elif entry.name.lower().endswith(self._ext_tuple) and entry.is_file():
+                    yield Path(entry.path)
 
     def get_audio_files(self) -> List[Path]:
         """Get all supported audio files from input folder recursively"""
-        audio_files = []
-        for file_path in self.input_folder.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_formats:
-                audio_files.append(file_path)
+        audio_files = list(self._walk(str(self.input_folder)))
 
         self.logger.info(f"Found {len(audio_files)} audio files")
         return audio_files
 
-    def validate_audio_file(self, file_path: Path) -> bool:
-        """Validate if audio file is not corrupted"""
+    def validate_audio_file(self, file_path: Path) -> Optional[int]:
+        """Validate if audio file is not corrupted, returning its duration in milliseconds"""
         try:
-            audio = AudioSegment.from_file(str(file_path))
-            if len(audio) < 10000:  # Less than 10 second
+            # Read the duration from the container header, ask ffprobe if mutagen does not know the format
+            audio = MutaFile(str(file_path))
+            if audio is not None and audio.info.length > 0:
+                length = int(audio.info.length * 1000)
+            else:
+                length = self.probe_duration(file_path)
+
+            if length < 10000:  # Less than 10 second
                 self.logger.warning(f"Audio file too short: {file_path.name}")
-                return False
-            return True
+                return None
+            return length
         except Exception as e:
             self.logger.error(f"Corrupted audio file {file_path.name}: {e}")
-            return False
+            return None
 
-    def create_random_clip(self, audio_path: Path, duration: int = 10) -> Optional[str]:
+    def probe_duration(self, file_path: Path) -> int:
+        """Get duration in milliseconds from ffprobe, which reads the container without decoding"""
+        command = [
+            'ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1', str(file_path)
+        ]
+        result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, check=True, timeout=120)
+        return int(float(result.stdout) * 1000)
+
+    def clip_window(self, total_duration: int, duration: int = 10) -> Tuple[int, int]:
         """
-        Create a random clip from audio file, with better error handling
+        Pick a random clip window from the file duration alone, without touching the audio
 
         Args:
-            audio_path: Path to the audio file
+            total_duration: Duration of the audio file in milliseconds
             duration: Duration of clip in seconds (default: 10)
 
         Returns:
-            Path to temporary clip file or None if failed
+            Tuple of (clip start, clip end) in milliseconds
+        """
+        clip_length = duration * 1000
+
+        # If audio is too short, use the whole file
+        if total_duration < clip_length:
+            return 0, total_duration
+
+        # Calculate safe zone (exclude first and last 15% for better results)
+        safe_start = total_duration * 15 // 100
+        safe_end = total_duration * 85 // 100
+
+        # Ensure we have enough space for the clip
+        if safe_end - safe_start < clip_length:
+            # If safe zone is too small, use middle portion
+            clip_start = max(0, total_duration // 2 - clip_length // 2)
+        else:
+            # Random start position within safe zone
+            clip_start = random.randint(safe_start, safe_end - clip_length)
+
+        return clip_start, clip_start + clip_length
+
+    def create_random_clip(self, audio_path: Path, clip_start: int, clip_end: int) -> Optional[io.BytesIO]:
+        """
+        Create a clip from audio file, with better error handling
+
+        Args:
+            audio_path: Path to the audio file
+            clip_start: Start of the clip in milliseconds, from clip_window
+            clip_end: End of the clip in milliseconds, from clip_window
+
+        Returns:
+            In-memory MP3 clip or None if failed
         """
         try:
-            # Load audio file
-            audio = AudioSegment.from_file(str(audio_path))
-            total_duration = len(audio)  # in milliseconds
-
-            # If audio is too short, use the whole file
-            if total_duration < duration * 1000:
-                self.logger.warning(f"{audio_path.name} is shorter than {duration} seconds, using full file")
-                clip = audio
-            else:
-                # Calculate safe zone (exclude first and last 15% for better results)
-                safe_start = int(total_duration * 0.15)
-                safe_end = int(total_duration * 0.85)
-
-                # Ensure we have enough space for the clip
-                if safe_end - safe_start < duration * 1000:
-                    # If safe zone is too small, use middle portion
-                    middle = total_duration // 2
-                    clip_start = max(0, middle - (duration * 500))
-                else:
-                    # Random start position within safe zone
-                    max_start = safe_end - (duration * 1000)
-                    clip_start = random.randint(safe_start, max_start)
+            # Seek on the input side so ffmpeg only decodes the clip, and read the MP3 from stdout
+            command = [
+                'ffmpeg', '-nostdin', '-v', 'error',
+                '-ss', f'{clip_start / 1000:.3f}', '-t', f'{(clip_end - clip_start) / 1000:.3f}',
+                '-i', str(audio_path), '-vn', '-b:a', '128k', '-f', 'mp3', 'pipe:1'
+            ]
+            # run() drains stdout and stderr together, so a noisy stderr cannot stall ffmpeg
+            result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, timeout=120)
+            if result.returncode != 0:
+                self.logger.error(f"Error creating clip for {audio_path}: "
+                                  f"{result.stderr.decode(errors='replace').strip()}")
+                return None
 
-                clip_end = clip_start + (duration * 1000)
-                clip = audio[clip_start:clip_end]
+            # BytesIO shares the bytes object instead of copying it
+            return io.BytesIO(result.stdout)
 
-            # Save clip to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-            clip.export(temp_file.name, format="mp3", bitrate="128k")
-            return temp_file.name
+        except subprocess.TimeoutExpired:
+            self.logger.error(f"Timed out creating clip for {audio_path}")
+            return None
 
         except Exception as e:
             self.logger.error(f"Error creating clip for {audio_path}: {e}")
             return None
 
-    def identify_song(self, clip_path: str, retries: int = 3) -> Optional[Dict[Any, Any]]:
+    def increase_rate(self):
+        """Additive increase of the request rate after a successful API call"""
+        if self.rate_limiter:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+            self.rate_limiter.refill()
+            self.rate_limiter.fill_rate = self.rate
+
+    def decrease_rate(self):
+        """Multiplicative decrease of the request rate after the API reported a rate limit"""
+        self.rate = max(self.min_rate, self.rate * 0.5)
+        self.rate_limiter.refill()
+        self.rate_limiter.fill_rate = self.rate
+        self.rate_limiter.drain()
+        self.logger.warning(f"Rate limited, slowing down to {self.rate:.2f} requests per second")
+
+    async def identify_song_async(self, session: aiohttp.ClientSession, clip: io.BytesIO,
+                                  retries: int = 3) -> Optional[Dict[Any, Any]]:
         """
         Identify song using Audd API with retry logic
 
         Args:
-            clip_path: Path to audio clip
+            session: Shared aiohttp session for the API
+            clip: In-memory MP3 clip
             retries: Number of retries on failure
 
         Returns:
@@ -161,50 +412,68 @@ class AudioOrganizer:
         """
         for attempt in range(retries):
             try:
-                data = {
-                    'api_token': self.api_token,
-                    'return': 'apple_music,spotify',
-                }
-
-                with open(clip_path, 'rb') as audio_file:
-                    files = {'file': audio_file}
-                    response = requests.post('https://api.audd.io/', data=data, files=files, timeout=30)
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('status') == 'success' and result.get('result'):
+                # Form data is consumed by the request, so build it per attempt
+                data = aiohttp.FormData()
+                data.add_field('api_token', self.api_token)
+                data.add_field('return', 'apple_music,spotify')
+                # The clip is already in memory, getvalue() hands over its bytes without a copy
+                data.add_field('file', clip.getvalue(), filename='clip.mp3', content_type='audio/mpeg')
+
+                async with self.api_semaphore:
+                    if self.rate_limiter:
+                        await self.rate_limiter.acquire()
+                    async with session.post('https://api.audd.io/', data=data,
+                                            timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        status = response.status
+                        result = await response.json(content_type=None) if status == 200 else None
+
+                # Audd reports its errors, rate limits included, inside a 200 response body
+                error = result.get('error') if status == 200 else None
+                if status == 200 and result.get('status') == 'success':
+                    self.increase_rate()
+                    if result.get('result'):
                         return result['result']
                     else:
-                        self.logger.debug(f"Song not identified: {result.get('error', 'Unknown error')}")
+                        self.logger.debug("Song not identified: no match")
                         return None
-                elif response.status_code == 901:  # Rate limited or API limited
-                    wait_time = 2 ** attempt
+                elif status == 200:
+                    status = error.get('error_code') if isinstance(error, dict) else None
+
+                if status in (901, 429):  # Rate limited or API limited
+                    if self.rate_limiter:
+                        # The slower bucket spaces out the retry, no fixed backoff needed
+                        self.decrease_rate()
+                        continue
+                    wait_time = min(2 ** attempt, 60)
                     self.logger.warning(f"Rate limited, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                     continue
-                elif response.status_code == 900:  # Invalid API Token
+                elif status == 900:  # Invalid API Token
                     self.logger.warning(f"Invalid API token.")
                     return None
-                elif response.status_code == 700:  # No file
+                elif status == 700:  # No file
                     self.logger.warning(f"Missing file attached to request.")
                     return None
-                elif response.status_code == 500:  # Invalid file
+                elif status == 500:  # Invalid file
                     self.logger.warning(f"Invalid file.")
                     return None
-                elif response.status_code == 400:  # File too big
+                elif status == 400:  # File too big
                     self.logger.warning(f"File size too large.")
                     return None
-                elif response.status_code == 300:  # File too small
+                elif status == 300:  # File too small
                     self.logger.warning(f"File too small to recognize song.")
                     return None
+                elif status is None:
+                    self.logger.debug(f"Song not identified: {error or 'Unknown error'}")
+                    return None
                 else:
-                    self.logger.error(f"API request failed with status code: {response.status_code}")
+                    self.logger.error(f"API request failed with status code: {status}")
                     return None
 
-            except requests.exceptions.Timeout:
+            except asyncio.TimeoutError:
                 self.logger.warning(f"Request timeout, attempt {attempt + 1}/{retries}")
                 if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
+                    await asyncio.sleep(min(2 ** attempt, 60))
                     continue
             except Exception as e:
                 self.logger.error(f"Error identifying song: {e}")
@@ -212,17 +481,15 @@ class AudioOrganizer:
 
         return None
 
-    def sanitize_filename(self, name: str) -> str:
-        """Remove or replace invalid characters for file/folder names"""
-        # Characters that are invalid in most file systems
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, '_')
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def sanitize_filename(name: str) -> str:
+        """Remove or replace invalid characters for file/folder names, cached as names repeat across tracks"""
+        name = name.translate(_INVALID_TABLE)
 
         # Remove content in parentheses and brackets
-        import re
-        name = re.sub(r'\([^)]*\)', '', name)
-        name = re.sub(r'\[[^\]]*\]', '', name)
+        name = _PAREN.sub('', name)
+        name = _BRACK.sub('', name)
 
         # Remove leading/trailing spaces and dots
         name = name.strip('. ')
@@ -233,6 +500,12 @@ class AudioOrganizer:
 
         return name or "Unknown"
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _ensure_dir(path_str: str):
+        """Create a directory once, later songs in the same album skip the mkdir"""
+        Path(path_str).mkdir(parents=True, exist_ok=True)
+
     def create_folder_structure(self, song_info: Dict[Any, Any], original_file: Path) -> Path:
         """
         Create folder structure and return target path
@@ -272,7 +545,7 @@ class AudioOrganizer:
 
         # Create directories (unless dry run)
         if not self.dry_run:
-            target_folder.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(str(target_folder))
 
         # Create target file path
         file_extension = original_file.suffix
@@ -296,19 +569,19 @@ class AudioOrganizer:
             return True
 
         try:
-            # Handle duplicates by comparing file hashes
+            # Handle duplicates by comparing file sizes, then hashes if sizes match
             if target.exists():
-                source_hash = self.get_file_hash(source)
-                target_hash = self.get_file_hash(target)
+                source_size = os.path.getsize(source)
+                target_size = os.path.getsize(target)
 
-                if source_hash == target_hash:
+                if source_size == target_size and self._hash_of(source) == self._hash_of(target):
                     self.logger.info(f"Identical file already exists, removing duplicate: {source.name}")
                     os.remove(source)
                     return True
 
                 # If different files, keep the larger one
                 self.logger.info(f"Found different versions of {target.name}")
-                if os.path.getsize(source) > os.path.getsize(target):
+                if source_size > target_size:
                     os.remove(target)
                     shutil.move(str(source), str(target))
                     self.logger.info(f"Replaced with larger version: {source.name}")
@@ -325,70 +598,111 @@ class AudioOrganizer:
             self.logger.error(f"Error moving file {source} to {target}: {e}")
             return False
 
-    def process_file(self, file_path: Path) -> bool:
+    def prepare_file(self, file_path: Path) -> Tuple[bool, Optional[io.BytesIO]]:
         """
-        Process a single audio file
+        Validate, deduplicate and clip a single audio file, safe to run in worker threads
 
         Args:
             file_path: Path to audio file
 
         Returns:
-            True if successful, False otherwise
+            Tuple of (success, clip). A successful result without a clip
+            means the file was a duplicate and does not need identification
         """
-        self.logger.info(f"Processing: {file_path.name}")
+        self.logger.debug(f"Preparing: {file_path.name}")
 
         # Validate audio file first
-        if not self.validate_audio_file(file_path):
+        total_duration = self.validate_audio_file(file_path)
+        if not total_duration:
             self.failed_files.append(str(file_path))
-            return False
+            return False, None
 
         # Check if file is a duplicate
-        file_hash = self.get_file_hash(file_path)
-        if file_hash in self.file_hashes:
+        if self.is_duplicate(file_path):
             self.logger.info(f"Duplicate file detected: {file_path.name}")
             if not self.dry_run:
                 os.remove(file_path)
-            return True
+            return True, None
 
-        self.file_hashes[file_hash] = str(file_path)
+        # Pick the clip window from the header duration, ffmpeg then decodes only that window
+        clip_start, clip_end = self.clip_window(total_duration, self.clip_duration)
+        if clip_end - clip_start < self.clip_duration * 1000:
+            self.logger.warning(f"{file_path.name} is shorter than {self.clip_duration} seconds, using full file")
 
         # Create random clip
-        clip_path = self.create_random_clip(file_path, self.clip_duration)
-        if not clip_path:
+        clip = self.create_random_clip(file_path, clip_start, clip_end)
+        if not clip:
+            self.failed_files.append(str(file_path))
+            return False, None
+
+        return True, clip
+
+    async def identify_file(self, session: aiohttp.ClientSession, file_path: Path, clip: io.BytesIO) -> bool:
+        """
+        Identify a prepared file from its clip and move it into place
+
+        Args:
+            session: Shared aiohttp session for the API
+            file_path: Path to audio file
+            clip: Clip created by prepare_file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # Identify song
+        song_info = await self.identify_song_async(session, clip)
+        if not song_info:
+            self.logger.warning(f"Could not identify {file_path.name}")
             self.failed_files.append(str(file_path))
             return False
 
-        try:
-            # Identify song
-            song_info = self.identify_song(clip_path)
-            if not song_info:
-                self.logger.warning(f"Could not identify {file_path.name}")
-                self.failed_files.append(str(file_path))
-                return False
+        # Moving can hash or copy whole files, so keep it off the event loop while other
+        # requests are in flight. A single mover thread keeps target collisions serialized.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.move_executor, self.organize_file, song_info, file_path)
 
-            # Create folder structure and move file
-            target_path = self.create_folder_structure(song_info, file_path)
-            success = self.move_file(file_path, target_path)
+    def organize_file(self, song_info: Dict[Any, Any], file_path: Path) -> bool:
+        """
+        Move an identified file into the folder structure and record the result
 
-            if success:
-                self.processed_files.append({
-                    'original_path': str(file_path),
-                    'target_path': str(target_path),
-                    'artist': song_info.get('artist', 'Unknown'),
-                    'title': song_info.get('title', 'Unknown'),
-                    'album': song_info.get('album', '')
-                })
-                self.logger.info(
-                    f"Successfully organized: {song_info.get('artist', 'Unknown')} - {song_info.get('title', 'Unknown')}")
+        Args:
+            song_info: Song information from API
+            file_path: Path to audio file
 
-            return success
+        Returns:
+            True if successful, False otherwise
+        """
+        # Create folder structure and move file
+        target_path = self.create_folder_structure(song_info, file_path)
+        size = file_path.stat().st_size
 
-        finally:
-            # Clean up temporary clip
-            try:
-                os.unlink(clip_path)
-            except:
-                pass
+        # Hold the size lock so a worker hashing this bucket never sees the file mid-move
+        with self.size_lock(size):
+            success = self.move_file(file_path, target_path)
+            if success and not self.dry_run:
+                self.update_size_index(file_path, target_path, size)
+
+        if success:
+            entry = {
+                'original_path': str(file_path),
+                'target_path': str(target_path),
+                'artist': song_info.get('artist', 'Unknown'),
+                'title': song_info.get('title', 'Unknown'),
+                'album': song_info.get('album', '')
+            }
+            self.processed_files.append(entry)
+            self.append_result(entry)
+            self.logger.info(
+                f"Successfully organized: {song_info.get('artist', 'Unknown')} - {song_info.get('title', 'Unknown')}")
+
+        return success
+
+    def append_result(self, entry: Dict[str, Any]):
+        """Append one processed file to the JSONL log so progress survives a crash"""
+        if self.results_log:
+            # Tag each line with its run so entries from separate runs can be told apart
+            self.results_log.write(orjson.dumps({**entry, 'run': self.run_id}) + b'\n')
+            self.results_log.flush()
 
     def save_results(self, stats: ProcessingStats):
         """Save processing results to JSON file"""
@@ -405,18 +719,95 @@ class AudioOrganizer:
         }
 
         results_file = self.output_folder / 'organization_results.json'
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
 
         self.logger.info(f"Results saved to {results_file}")
 
-    def organize_library(self, delay: float = 1.0, max_workers: int = 1) -> ProcessingStats:
+    def prepare_file_safe(self, file_path: Path) -> Tuple[bool, Optional[io.BytesIO]]:
+        """Prepare a file in a worker thread, reporting unexpected errors as a failure"""
+        try:
+            return self.prepare_file(file_path)
+        except Exception as e:
+            self.logger.error(f"Unexpected error processing {file_path.name}: {e}")
+            return False, None
+
+    async def organize_async(self, audio_files: List[Path], stats: ProcessingStats, rps: Optional[float],
+                             max_workers: int, concurrency: int):
+        """Run the prepare workers and the API consumers until every file is handled"""
+        # Limits shared by all API requests, created inside the running event loop
+        self.api_semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = TokenBucket(capacity=max(1.0, rps), fill_rate=rps) if rps else None
+
+        # AIMD bounds, the rate starts at the plan's limit and never goes above it
+        self.max_rate = rps
+        self.min_rate = min(rps, 0.05) if rps else None
+        self.rate = rps
+
+        loop = asyncio.get_running_loop()
+        pending = iter(audio_files)
+        completed = 0
+
+        # Small bound so workers do not run far ahead of the API holding clips
+        ready = asyncio.Queue(maxsize=4)
+
+        async def produce(executor: ThreadPoolExecutor):
+            for file_path in pending:
+                success, clip = await loop.run_in_executor(executor, self.prepare_file_safe, file_path)
+                await ready.put((file_path, success, clip))
+
+        async def consume(session: aiohttp.ClientSession):
+            nonlocal completed
+            while True:
+                item = await ready.get()
+                if item is None:
+                    return
+
+                file_path, success, clip = item
+                completed += 1
+                self.logger.info(f"[{completed}/{len(audio_files)}] Processing: {file_path.name}")
+
+                if clip:
+                    try:
+                        success = await self.identify_file(session, file_path, clip)
+                    except Exception as e:
+                        self.logger.error(f"Unexpected error processing {file_path.name}: {e}")
+                        success = False
+
+                if success:
+                    stats.success += 1
+                else:
+                    stats.failed += 1
+
+        self.move_executor = ThreadPoolExecutor(max_workers=1)
+        connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=60)
+        try:
+            async with aiohttp.ClientSession(connector=connector) as session:
+                consumers = [asyncio.create_task(consume(session)) for _ in range(concurrency)]
+
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    await asyncio.gather(*(produce(executor) for _ in range(max_workers)))
+
+                # One stop marker per consumer once every file has been queued
+                for _ in consumers:
+                    await ready.put(None)
+                await asyncio.gather(*consumers)
+        finally:
+            self.move_executor.shutdown()
+
+    def organize_library(self, delay: float = 1.0, max_workers: Optional[int] = None,
+                         concurrency: int = 1, rps: Optional[float] = None) -> ProcessingStats:
         """
         Organize entire music library
 
+        Validation, hashing and clip creation run in a pool of worker threads while
+        the prepared clips are sent to the API from an asyncio event loop.
+
         Args:
-            delay: Delay between API calls to avoid rate limiting
-            max_workers: Number of parallel workers (set to 1 for API rate limiting)
+            delay: Minimum delay between API calls, used when rps is not given
+            max_workers: Number of worker threads preparing files (default: CPU count)
+            concurrency: Maximum number of API requests in flight at once
+            rps: API requests per second allowed by your Audd plan
 
         Returns:
             ProcessingStats object with processing statistics
@@ -426,24 +817,22 @@ class AudioOrganizer:
 
         self.logger.info(f"Starting to process {len(audio_files)} audio files")
 
-        # Process files sequentially to respect API rate limits
-        for i, file_path in enumerate(audio_files, 1):
-            self.logger.info(f"[{i}/{len(audio_files)}] Processing: {file_path.name}")
+        if rps is None and delay > 0:
+            rps = 1 / delay
 
-            try:
-                success = self.process_file(file_path)
-                if success:
-                    stats.success += 1
-                else:
-                    stats.failed += 1
-
-            except Exception as e:
-                self.logger.error(f"Unexpected error processing {file_path.name}: {e}")
-                stats.failed += 1
+        # Incremental log of organized files, the summary is written by save_results
+        # Dry runs move nothing, so they stay out of the recovery log
+        results_log_file = self.output_folder / 'organization_results.jsonl'
+        self.run_id = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.results_log = open(results_log_file, 'ab') if not self.dry_run else None
 
-            # Add delay to avoid overwhelming the API
-            if i < len(audio_files) and delay > 0:
-                time.sleep(delay)
+        try:
+            asyncio.run(self.organize_async(audio_files, stats, rps, max_workers or os.cpu_count(), concurrency))
+        finally:
+            if self.results_log:
+                self.results_log.close()
+            # Commit batched hash writes even if the run was interrupted
+            self.close_hash_cache()
 
         # Save results
         self.save_results(stats)
@@ -460,6 +849,11 @@ def main():
     parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                         help='Set logging level')
     parser.add_argument('--clip-duration', type=int, default=10, help='Duration of audio clips for identification')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker threads for validation, hashing and clip creation (default: CPU count)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Maximum number of API requests in flight')
+    parser.add_argument('--rps', type=float, default=None,
+                        help='API requests per second allowed by your plan (overrides --delay)')
 
     args = parser.parse_args()
 
@@ -483,7 +877,8 @@ def main():
         print("DRY RUN MODE: No files will be moved")
 
     print(f"Starting to organize files from '{args.input}' to '{args.output}'")
-    stats = organizer.organize_library(delay=args.delay)
+    stats = organizer.organize_library(delay=args.delay, max_workers=args.workers,
+                                       concurrency=args.concurrency, rps=args.rps)
 
     # Print summary
     print(f"\n=== SUMMARY ===")